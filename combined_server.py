@@ -1,32 +1,83 @@
 import asyncio
-import base64
+import os
+import random
 import threading
 import time
+import warnings
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List
 
-import cv2
 import numpy as np
+import orjson
+import torch
+from torchvision.io import ImageReadMode, decode_jpeg
+from torchvision.transforms.functional import resize
 import firebase_admin
-from firebase_admin import credentials, firestore, storage, db as rtdb
+from firebase_admin import credentials, storage, db as rtdb
+from google.cloud.firestore import AsyncClient, SERVER_TIMESTAMP
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from websockets.exceptions import ConnectionClosed
 from ultralytics import YOLO
 
 # ----------------------- CONFIG -----------------------
 # Firebase
 SERVICE_ACCOUNT_PATH = "/app/firebase_service_account.json" 
 FIREBASE_DB_URL = "https://iot888-24430-default-rtdb.asia-southeast1.firebasedatabase.app"
+TELEMETRY_FLUSH_INTERVAL = 0.5  # Seconds of telemetry batched into one write
+FIRESTORE_BATCH_LIMIT = 500  # Max writes Firestore accepts in one batch
 
 # YOLO
 YOLO_WEIGHTS = "yolov8n.pt"
+VEHICLE_LABELS = {"car", "truck", "bus", "motorcycle"}
+# Frames per inference call. The GPU engine is built for exactly this batch and every call
+# pays for all INFER_BATCH slots, however many are filled. A call only fills up when frames
+# from several cameras arrive within BATCH_WAIT of each other, so keep 1 for a single camera
+# and only raise it when the extra slots are actually being filled.
+INFER_BATCH = int(os.environ.get("INFER_BATCH", "1"))
+INFER_SIZE = 640  # Frames are resized to INFER_SIZE x INFER_SIZE before inference
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 MIN_INTERVAL = 1.0  # Process 1 frame per second
+BATCH_WAIT = 0.25 * MIN_INTERVAL  # How long the first frame of a batch waits for others to join it
 MIN_PUBLISH_DELAY = 5 # Don't switch lights too fast
 
-app = FastAPI()
+if INFER_BATCH < 1:
+    raise RuntimeError(f"INFER_BATCH must be at least 1, got {INFER_BATCH}")
+
+def load_model():
+    """Load YOLO, exporting a TensorRT FP16 engine on first start if a GPU is available"""
+    if DEVICE != "cuda":
+        return YOLO(YOLO_WEIGHTS)
+
+    # Static (INFER_BATCH, 3, INFER_SIZE, INFER_SIZE) input: TensorRT specializes every
+    # layer for that one shape and skips per-call shape dispatch. The batch size is in the
+    # file name so changing INFER_BATCH triggers a fresh export.
+    engine_path = f"{os.path.splitext(YOLO_WEIGHTS)[0]}_b{INFER_BATCH}_{INFER_SIZE}.engine"
+    if not os.path.exists(engine_path):
+        exported = YOLO(YOLO_WEIGHTS).export(
+            format="engine", half=True, dynamic=False, batch=INFER_BATCH, imgsz=INFER_SIZE
+        )
+        os.replace(exported, engine_path)
+    return YOLO(engine_path, task="detect")
 
 # Global state
-model = YOLO(YOLO_WEIGHTS) # Add .to('cuda') if GPU available
-last_frame = None
+model = load_model()
+# Resolve labels to class ids once so the hot path only compares integers
+CLASS_NAMES = tuple(model.names[i] for i in range(len(model.names)))
+if not VEHICLE_LABELS <= set(CLASS_NAMES):
+    raise RuntimeError(f"VEHICLE_LABELS not in model classes: {sorted(VEHICLE_LABELS - set(CLASS_NAMES))}")
+VEHICLE_IDS = frozenset(i for i, name in enumerate(CLASS_NAMES) if name in VEHICLE_LABELS)
+VEHICLE_ID_ARRAY = np.fromiter(sorted(VEHICLE_IDS), dtype=np.int32)
+infer_queue = asyncio.Queue()  # (frame, future) pairs waiting for the batch worker
+# Persistent model input, filled in place each batch instead of going through Ultralytics' LetterBox
+batch_buf = torch.empty(
+    (INFER_BATCH, 3, INFER_SIZE, INFER_SIZE),
+    dtype=torch.float16 if DEVICE == "cuda" else torch.float32,
+    device=DEVICE,
+)
+copy_stream = torch.cuda.Stream() if DEVICE == "cuda" else None  # JPEG decode + batch staging
+last_frame = None  # Latest raw JPEG from the preview camera, for the preview stream
 last_frame_lock = threading.Lock()
 
 # Firebase Init
@@ -34,7 +85,8 @@ cred = credentials.Certificate(SERVICE_ACCOUNT_PATH)
 firebase_admin.initialize_app(cred, {
     "databaseURL": FIREBASE_DB_URL
 })
-db = firestore.client()
+db = AsyncClient(credentials=cred.get_credential(), project=cred.project_id)
+pending_telemetry = deque()  # Traffic decisions waiting to be written to Firebase
 
 # ---------------- WebSocket Manager ----------------
 # This allows the API to send messages to the connected Raspi
@@ -52,30 +104,218 @@ class ConnectionManager:
     async def send_command(self, message: dict):
         # Broadcast command to all connected cameras (usually just one)
         for connection in self.active_connections:
-            await connection.send_json(message)
+            await connection.send_bytes(dumps(message))
 
 manager = ConnectionManager()
 
+# ---------------- Serialization ----------------
+# Messages to the Raspi go out as orjson-encoded binary frames; numpy values serialize directly
+ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def dumps(message):
+    return orjson.dumps(message, option=ORJSON_OPTS)
+
+SKIPPED_MSG = dumps({"status": "skipped"})
+
 # ---------------- Utilities ----------------
-def log_traffic_decision(zone_id):
-    """Log the decision to Firebase"""
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+last_push_ms = None
+last_push_rand = []  # Random suffix digits of the last key, incremented on a repeated millisecond
+
+def push_key(ms):
+    """
+    Chronologically sortable key for epoch milliseconds ms, in the same format as RTDB push().
+    Keys made for the same millisecond bump the random suffix so they keep their creation order.
+    """
+    global last_push_ms, last_push_rand
+    if ms == last_push_ms:
+        i = len(last_push_rand) - 1
+        while last_push_rand[i] == 63:
+            last_push_rand[i] = 0
+            i -= 1
+        last_push_rand[i] += 1
+    else:
+        last_push_rand = random.choices(range(64), k=12)
+    last_push_ms = ms
+
+    ts = ""
+    for _ in range(8):
+        ts = PUSH_CHARS[ms % 64] + ts
+        ms //= 64
+    return ts + "".join(PUSH_CHARS[d] for d in last_push_rand)
+
+async def log_traffic_decision(zone_id):
+    """Queue the decision for the telemetry writer, never waits on Firebase"""
+    now = time.time()
+    pending_telemetry.append({
+        "payload": str(zone_id),
+        "ms": int(now * 1000),
+        "ts": datetime.utcfromtimestamp(now).isoformat() + "Z",
+    })
+
+def write_rtdb(records):
+    """Write a batch of traffic decisions to the Realtime DB (blocking, run in a thread)"""
+    # One multi-location update instead of a push() per record
+    rtdb.reference("telemetry/iot_backend_traffic").update({
+        push_key(rec["ms"]): {"payload": rec["payload"], "timestamp": rec["ts"]}
+        for rec in records
+    })
+
+async def write_firestore(records):
+    """Write a batch of traffic decisions to Firestore, one commit per FIRESTORE_BATCH_LIMIT records"""
+    col = db.collection("telemetry")
+    for i in range(0, len(records), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for rec in records[i:i + FIRESTORE_BATCH_LIMIT]:
+            batch.set(col.document(), {
+                "topic": "iot/backend/traffic",
+                "payload": rec["payload"],
+                "ts": SERVER_TIMESTAMP,
+                "ts_local": rec["ts"],
+            })
+        await batch.commit()
+
+async def flush_telemetry():
+    """Write out every pending decision"""
+    if not pending_telemetry:
+        return
+
+    records = list(pending_telemetry)
+    pending_telemetry.clear()
+    results = await asyncio.gather(
+        write_firestore(records),
+        asyncio.to_thread(write_rtdb, records),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print("Firebase Error:", result)
+
+async def telemetry_writer():
+    """Flush pending decisions every TELEMETRY_FLUSH_INTERVAL without blocking the event loop"""
+    while True:
+        await asyncio.sleep(TELEMETRY_FLUSH_INTERVAL)
+        # Shielded so cancelling the writer at shutdown never drops a batch mid-write
+        app.state.telemetry_flush = asyncio.create_task(flush_telemetry())
+        await asyncio.shield(app.state.telemetry_flush)
+
+# decode_jpeg only reads its input, so wrapping the received bytes without a copy is safe.
+# The warning is attributed to the calling frame, so this only silences torch.frombuffer here.
+warnings.filterwarnings(
+    "ignore", message="The given buffer is not writable", category=UserWarning, module=__name__
+)
+
+def decode_frame(img_bytes):
+    """Decode a JPEG into a (3, H, W) RGB uint8 tensor on DEVICE (nvJPEG when on GPU)"""
+    data = torch.frombuffer(img_bytes, dtype=torch.uint8)
+    with torch.cuda.stream(copy_stream):
+        return decode_jpeg(data, mode=ImageReadMode.RGB, device=DEVICE)
+
+@torch.inference_mode()
+def run_batch(frames):
+    """
+    Run YOLO on a list of decoded (3, H, W) RGB uint8 frames, staging them into batch_buf.
+    Results are returned on the CPU.
+    """
+    with torch.cuda.stream(copy_stream):
+        n = len(frames)
+        for i, frame in enumerate(frames):
+            if frame.shape[-2:] != (INFER_SIZE, INFER_SIZE):
+                frame = resize(frame, [INFER_SIZE, INFER_SIZE], antialias=False)
+            # uint8 -> normalized float16 written straight into the batch slot, one pass per frame
+            torch.div(frame, 255.0, out=batch_buf[i])
+        # The static engine always takes a full batch; unused slots just hold stale frames
+        batch = batch_buf if DEVICE == "cuda" else batch_buf[:n]
+
+    # TensorRT runs on its own stream, which no torch stream ordering covers,
+    # so wait on the host until this batch is fully written
+    if copy_stream is not None:
+        copy_stream.record_event().synchronize()
+
+    results = model(batch, verbose=False)
+    # Copy boxes back here so the event loop never blocks on a device sync
+    return [r.cpu() for r in results[:n]]
+
+def warmup():
+    """Run a full dummy batch so engine setup happens before the first live frame"""
+    dummy = torch.zeros((3, INFER_SIZE, INFER_SIZE), dtype=torch.uint8, device=DEVICE)
+    run_batch([dummy] * INFER_BATCH)
+
+def count_zones(xyxy, cls):
+    """
+    Count vehicles per zone (left / middle / right third of the frame).
+    Boxes are in model space, so zones are equal thirds of INFER_SIZE.
+    Returns the vehicle mask over the boxes and the per-zone counts.
+    """
+    vehicle_mask = np.isin(cls, VEHICLE_ID_ARRAY)
+    cx = (xyxy[vehicle_mask, 0] + xyxy[vehicle_mask, 2]).astype(np.int32) // 2
+    # Equal thirds: the zone is just an integer divide, clamped for boxes touching the right edge
+    zone_idx = np.minimum(cx * 3 // INFER_SIZE, 2)
+    return vehicle_mask, np.bincount(zone_idx, minlength=3)
+
+# ---------------- Batched Inference ----------------
+async def infer(frame):
+    """Queue a frame for the batch worker and wait for its YOLO result"""
+    future = asyncio.get_running_loop().create_future()
+    await infer_queue.put((frame, future))
+    return await future
+
+async def inference_worker():
+    """
+    Coalesce frames from all connections into a single model call, one batch at a time.
+    A batch goes out once it holds INFER_BATCH frames or BATCH_WAIT after its
+    first frame arrived, whichever comes first.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await infer_queue.get()]
+        deadline = loop.time() + BATCH_WAIT
+        while len(batch) < INFER_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(infer_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        frames = [frame for frame, _ in batch]
+        try:
+            # Run off the event loop so websockets keep flowing during inference
+            results = await asyncio.to_thread(run_batch, frames)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+# ---------------- App ----------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # If warmup fails the server never starts, so shutdown only sees tasks that exist
+    await asyncio.to_thread(warmup)
+    inference_task = asyncio.create_task(inference_worker())
+    telemetry_task = asyncio.create_task(telemetry_writer())
+
+    yield
+
+    # Stop the periodic writer, let an in-flight write finish, then flush whatever is left
+    telemetry_task.cancel()
     try:
-        ts = datetime.utcnow().isoformat() + "Z"
-        payload = str(zone_id)
-        # Firestore
-        db.collection("telemetry").add({
-            "topic": "iot/backend/traffic",
-            "payload": payload,
-            "ts": firestore.SERVER_TIMESTAMP,
-            "ts_local": ts,
-        })
-        # Realtime DB
-        rtdb.reference("telemetry/iot_backend_traffic").push({
-            "payload": payload,
-            "timestamp": ts,
-        })
-    except Exception as e:
-        print("Firebase Error:", e)
+        await telemetry_task
+    except asyncio.CancelledError:
+        pass
+    if getattr(app.state, "telemetry_flush", None) is not None:
+        await app.state.telemetry_flush
+    await flush_telemetry()
+
+    inference_task.cancel()
+
+app = FastAPI(lifespan=lifespan)
 
 # ---------------- API Endpoints ----------------
 
@@ -92,121 +332,201 @@ async def publish_traffic(cmd: str):
     await manager.send_command({"type": "FORCE_COMMAND", "val": cmd})
     
     # Log to Firebase
-    log_traffic_decision(cmd)
+    await log_traffic_decision(cmd)
     
     return {"status": "sent_to_raspi", "cmd": cmd}
 
+# Frontend preview clients, each with a single-slot queue of JPEG bytes waiting to be sent.
+# The preview shows one camera: the longest-connected one, so frames from several cameras never mix.
+frontend_clients = {}
+
+def is_preview_camera(ws: WebSocket):
+    return bool(manager.active_connections) and manager.active_connections[0] is ws
+
+def broadcast_frame(jpg):
+    """Fan one JPEG out to every frontend, replacing any frame a slow client hasn't sent yet"""
+    for queue in frontend_clients.values():
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(jpg)
+
+async def iter_frames(ws: WebSocket):
+    """
+    Like ws.iter_bytes(), yielding raw JPEG frames until the client disconnects,
+    but skips text frames instead of failing on them.
+    """
+    while True:
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+        # Sensor updates arrive as text frames, images as binary frames
+        # You can expand this protocol later if needed
+        if message.get("text") is not None:
+            # Handle JSON sensor data if you send it here
+            continue
+
+        if message.get("bytes"):
+            yield message["bytes"]
+
+async def receive_frames(ws: WebSocket, mailbox: asyncio.Queue):
+    """
+    Receive raw JPEG frames and keep only the newest one in the mailbox.
+    Frames replaced before the processor got to them are acked as skipped
+    without ever being decoded.
+    """
+    async for img_bytes in iter_frames(ws):
+        # Preview gets every frame, already JPEG-encoded, so no decode or re-encode is needed
+        if is_preview_camera(ws):
+            with last_frame_lock:
+                global last_frame
+                last_frame = img_bytes
+            broadcast_frame(img_bytes)
+
+        if mailbox.full():
+            mailbox.get_nowait()
+            await ws.send_bytes(SKIPPED_MSG)
+        mailbox.put_nowait(img_bytes)
+
+    # Tears down the processor along with the rest of the task group
+    raise WebSocketDisconnect()
+
+async def process_frames(ws: WebSocket, mailbox: asyncio.Queue):
+    """Take the latest frame from the mailbox at most once per MIN_INTERVAL and run YOLO on it"""
+    last_time = 0.0
+    last_publish_time = 0
+    frame_hw = None  # Camera resolution, cached with the box scale on the first frame
+    box_scale = None
+
+    while True:
+        # 1. Rate Limiting: the receiver keeps replacing the mailbox while we wait
+        delay = last_time + MIN_INTERVAL - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        img_bytes = await mailbox.get()
+        last_time = time.time()
+
+        try:
+            frame = await asyncio.to_thread(decode_frame, img_bytes)
+        except RuntimeError:
+            continue
+
+        # 2. YOLO Logic
+        if frame.shape[-2:] != frame_hw:
+            frame_hw = frame.shape[-2:]
+            H, W = frame_hw
+            box_scale = np.array([W, H, W, H], dtype=np.float32) / INFER_SIZE
+
+        results = await infer(frame)
+
+        # One (N, 6) array per frame: x1, y1, x2, y2, conf, cls
+        data = results.boxes.data.numpy()
+        xyxy = data[:, :4]
+        cls = data[:, 5].astype(np.int32)
+        # Zones are thirds of the width, so they can be counted in model space
+        vehicle_mask, counts = count_zones(xyxy, cls)
+        # Map boxes back to the camera resolution for the Raspi
+        xyxy = (xyxy * box_scale).astype(np.int32)
+        zone_counts = {z + 1: n for z, n in enumerate(counts)}
+
+        detections = [
+            [*box, CLASS_NAMES[c]]
+            for box, c in zip(xyxy[vehicle_mask].tolist(), cls[vehicle_mask].tolist())
+        ]
+
+        # 3. Decision Logic
+        response_payload = {
+            "detections": detections,
+            "zone_counts": zone_counts,
+            "command": None # Default no command
+        }
+
+        now = time.time()
+        if now - last_publish_time >= MIN_PUBLISH_DELAY:
+            # Determine busiest zone
+            max_zone = max(zone_counts, key=zone_counts.get)
+
+            # PREPARE COMMAND FOR RASPI
+            response_payload["command"] = str(max_zone)
+
+            print(f"🚦 Decision: GREEN to Zone {max_zone}")
+            await log_traffic_decision(max_zone)
+            last_publish_time = now
+
+        # 4. Send Results & Command back to Raspi
+        await ws.send_bytes(dumps(response_payload))
+
 @app.websocket("/ws")
 async def inference_socket(ws: WebSocket):
     await manager.connect(ws)
     print("Raspi connected via WebSocket")
 
-    last_time = 0.0
-    last_publish_time = 0
+    # Single-slot mailbox: stale frames are dropped instead of queued
+    mailbox = asyncio.Queue(maxsize=1)
 
+    # Receiving and processing run side by side, so a slow inference never stalls ws.receive
     try:
-        while True:
-            # 1. Receive Image
-            data = await ws.receive_text()
-            
-            # Check if Raspi sent a sensor update (instead of image)
-            # You can expand this protocol later if needed
-            if data.startswith("{"):
-                # Handle JSON sensor data if you send it here
-                continue
-
-            img_bytes = base64.b64decode(data)
-            npimg = np.frombuffer(img_bytes, np.uint8)
-            frame = cv2.imdecode(npimg, cv2.IMREAD_COLOR)
-
-            if frame is None:
-                continue
-
-            # Update global frame for preview if needed
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(receive_frames(ws, mailbox))
+            tg.create_task(process_frames(ws, mailbox))
+    except* (WebSocketDisconnect, ConnectionClosed):
+        print("Raspi disconnected")
+    except* Exception as eg:
+        for e in eg.exceptions:
+            print("Error:", e)
+    finally:
+        if is_preview_camera(ws):
+            # The next camera takes over the preview; don't show new frontends this one's last frame
             with last_frame_lock:
                 global last_frame
-                last_frame = frame.copy()
-
-            # Rate Limiting
-            current_time = time.time()
-            if current_time - last_time < MIN_INTERVAL:
-                # Just acknowledge without heavy processing
-                await ws.send_json({"status": "skipped"})
-                continue
-
-            last_time = current_time
-
-            # 2. YOLO Logic
-            H, W, _ = frame.shape
-            zone_width = W // 3
-            zones = {
-                1: (0, zone_width),
-                2: (zone_width, 2 * zone_width),
-                3: (2 * zone_width, W)
-            }
-            zone_counts = {1: 0, 2: 0, 3: 0}
-
-            results = model(frame, verbose=False)[0]
-            detections = []
-
-            for box in results.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                cls = int(box.cls[0])
-                label = model.names[cls]
-
-                if label in ["car", "truck", "bus", "motorbike"]:
-                    center_x = int((x1 + x2) / 2)
-                    for z, (zx1, zx2) in zones.items():
-                        if zx1 <= center_x < zx2:
-                            zone_counts[z] += 1
-                            break
-                    
-                    detections.append([x1, y1, x2, y2, label])
-
-            # 3. Decision Logic
-            response_payload = {
-                "detections": detections,
-                "zone_counts": zone_counts,
-                "command": None # Default no command
-            }
-
-            now = time.time()
-            if now - last_publish_time >= MIN_PUBLISH_DELAY:
-                # Determine busiest zone
-                max_zone = max(zone_counts, key=zone_counts.get)
-                
-                # PREPARE COMMAND FOR RASPI
-                response_payload["command"] = str(max_zone)
-                
-                print(f"🚦 Decision: GREEN to Zone {max_zone}")
-                log_traffic_decision(max_zone)
-                last_publish_time = now
-
-            # 4. Send Results & Command back to Raspi
-            await ws.send_json(response_payload)
-
-    except WebSocketDisconnect:
-        manager.disconnect(ws)
-        print("Raspi disconnected")
-    except Exception as e:
-        print("Error:", e)
+                last_frame = None
         manager.disconnect(ws)
         
 
-frontend_clients = []
+async def watch_disconnect(ws: WebSocket):
+    """Wait for a frontend to close, ignoring anything it sends"""
+    while (await ws.receive())["type"] != "websocket.disconnect":
+        pass
+    # Tears down the sender along with the rest of the task group
+    raise WebSocketDisconnect()
+
+async def send_frames(ws: WebSocket, queue: asyncio.Queue):
+    while True:
+        await ws.send_bytes(await queue.get())
+
 @app.websocket("/ws/stream")
 async def video_stream(ws: WebSocket):
     await ws.accept()
-    frontend_clients.append(ws)
+    queue = asyncio.Queue(maxsize=1)
+    with last_frame_lock:
+        if last_frame is not None:
+            queue.put_nowait(last_frame)
+    frontend_clients[ws] = queue
     print("Frontend connected for video stream")
 
+    # Watch for the client closing alongside sending, so a frontend that
+    # leaves while no camera is streaming is still cleaned up
     try:
-        while True:
-            await asyncio.sleep(1)  # keep alive
-    except:
-        frontend_clients.remove(ws)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(watch_disconnect(ws))
+            tg.create_task(send_frames(ws, queue))
+    except* (WebSocketDisconnect, ConnectionClosed):
+        pass
+    finally:
+        del frontend_clients[ws]
         print("Frontend disconnected")
         
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("combined_server:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Single worker, no reloader: every camera must share one process (and one model
+    # on the GPU) for the batch worker to coalesce their frames
+    uvicorn.run(
+        "combined_server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=1,
+        loop="uvloop",
+        ws="websockets",
+        ws_per_message_deflate=False,  # JPEG frames don't compress, skip the deflate pass
+    )
\ No newline at end of file